@@ -1,19 +1,30 @@
+import enum
+
 from snaparg import SnapArgumentParser
 
 
+class Mode(enum.Enum):
+    FAST = "FAST"
+    SLOW = "SLOW"
+    MEDIUM = "MEDIUM"
+
+
 def main():
     parser = SnapArgumentParser(description="SnapArg demo script")
     parser.add_argument("--input", "-i", help="Input file")
     parser.add_argument("--output", "-o", help="Output file")
     parser.add_argument("--force", "-f", action="store_true", help="Force overwrite")
+    parser.add_argument("--mode", type=Mode, help="Choose a processing mode.")
+    parser.add_argument(
+        "--autofix", action="store_true", help="Automatically fix mistyped arguments."
+    )
 
-    args, unknown = parser.parse_known_args()
-    if unknown:
-        parser.error(f"unrecognized arguments: {' '.join(unknown)}")
+    args = parser.parse_args()
 
     print(f"Input: {args.input}")
     print(f"Output: {args.output}")
     print(f"Force: {args.force}")
+    print(f"Mode: {args.mode}")
 
 
 if __name__ == "__main__":
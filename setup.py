@@ -15,4 +15,5 @@ setup(
         "License :: OSI Approved :: Mozilla Public License 2.0 (MPL 2.0)",
     ],
     python_requires=">=3.6",
+    extras_require={"fast": ["rapidfuzz"]},
 )
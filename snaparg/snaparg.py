@@ -1,9 +1,10 @@
 import argparse
+import re
 import sys
-import difflib
 import enum
-import textwrap
-from functools import partial
+from functools import lru_cache, partial
+
+__all__ = ["SnapArgumentParser"]
 
 # ANSI colors
 BOLD = "\033[1m"
@@ -14,18 +15,182 @@ RED = "\033[91m"
 GREEN = "\033[92m"
 # End of ANSI colors
 
+# Pre-colorized error output; templates are filled in with str.format
+_EXPECTS_VALUE = (
+    f"\n{YELLOW}Error:{RESET} {{opt}} expects a value of type {BOLD}{CYAN}{{type_hint}}{RESET}."
+)
+_TRY_VALUE = "💡 Try: {opt}=value  or  {opt} value"
+_DID_YOU_MEAN = f"  Did you mean: {RED}{{wrong}}{RESET} → {BOLD}{GREEN}{{right}}{RESET}?"
+_ERROR_LINE = f"\n{RED}Error:{RESET} {{message}}"
+_TIP_LINE = f"\n{BOLD}Tip:{RESET} Run with {GREEN}--help{RESET} for usage."
+_TIP_EXAMPLES_LINE = f"\n{BOLD}Tip:{RESET} Run with {GREEN}--help{RESET} for usage examples."
+_AUTOFIX_LINE = f"{CYAN}Auto-fix enabled. Correcting and re-parsing...{RESET}"
+
+# Help section headers and their colorized replacements ("options:" is the 3.10+ spelling)
+_HELP_SECTION_REPL = {
+    "optional arguments:": f"{CYAN}Optional arguments:{RESET}",
+    "options:": f"{CYAN}Optional arguments:{RESET}",
+    "positional arguments:": f"{CYAN}Positional arguments:{RESET}",
+}
+_HELP_SECTION_RE = re.compile("|".join(map(re.escape, _HELP_SECTION_REPL)))
+
+# argparse reports a missing value as "argument -m/--mode: expected one argument"
+_EXPECTED_ARG_RE = re.compile(r"argument (\S+): expected one argument")
+
+# argparse accepts exit_on_error from Python 3.9 onwards
+_SUPPORTS_EXIT_ON_ERROR = sys.version_info >= (3, 9)
+
+# Help formatter with a wider option column, shared by every parser
+_DEFAULT_FORMATTER = partial(argparse.HelpFormatter, max_help_position=35)
+
+# Minimum similarity (0-1) for a flag to be suggested as a correction
+SUGGESTION_CUTOFF = 0.4
+# Smallest typo x option matrix worth scoring in one RapidFuzz cdist call
+_BATCH_MIN_CELLS = 1000
+
+
+@lru_cache(maxsize=None)
+def _rapidfuzz():
+    """
+    Returns RapidFuzz's (fuzz, process) modules, or None if it is not installed.
+
+    Imported on first use so that successful parses and --help never pay for loading it.
+    """
+    try:
+        from rapidfuzz import fuzz, process
+    except ImportError:  # Optional speedup
+        return None
+    return fuzz, process
+
+
+@lru_cache(maxsize=256)
+def _close_matches(input_opt, valid_options):
+    """Cached difflib.get_close_matches for a tuple of candidate options."""
+    import difflib  # Only needed on the error path, so keep it off the import path
+
+    return tuple(
+        difflib.get_close_matches(input_opt, valid_options, n=1, cutoff=SUGGESTION_CUTOFF)
+    )
+
+
+def _closest_option(input_opt, valid_options):
+    """
+    Returns the valid option most similar to input_opt, or None if nothing clears SUGGESTION_CUTOFF.
+
+    Uses RapidFuzz when it is installed and falls back to difflib otherwise. Candidates whose
+    length alone rules them out are dropped first: two strings of lengths a and b can share at
+    most min(a, b) characters, so their similarity is bounded by 2 * min(a, b) / (a + b).
+    """
+    n = len(input_opt)
+    valid_options = [
+        opt
+        for opt in valid_options
+        if 2 * min(n, len(opt)) >= SUGGESTION_CUTOFF * (n + len(opt))
+    ]
+    if not valid_options:
+        return None
+
+    rapidfuzz = _rapidfuzz()
+    if rapidfuzz is not None:
+        fuzz, process = rapidfuzz
+        match = process.extractOne(
+            input_opt,
+            valid_options,
+            scorer=fuzz.ratio,
+            processor=None,  # RapidFuzz < 3 lowercases and strips dashes by default
+            score_cutoff=SUGGESTION_CUTOFF * 100,
+        )
+        return match[0] if match else None
+
+    matches = _close_matches(input_opt, tuple(valid_options))
+    return matches[0] if matches else None
+
+
+def _closest_options(input_options, valid_options):
+    """
+    Returns (input, suggestion) pairs for every input option with a close enough valid option.
+
+    Large similarity matrices are scored in one RapidFuzz process.cdist call, but only when
+    numpy is already imported: cdist loads numpy on first use, which costs far more than it
+    saves for the handful of typos a CLI error usually involves. Everything else goes through
+    _closest_option.
+    """
+    rapidfuzz = _rapidfuzz()
+    if (
+        rapidfuzz is not None
+        and "numpy" in sys.modules
+        and len(input_options) * len(valid_options) >= _BATCH_MIN_CELLS
+    ):
+        fuzz, process = rapidfuzz
+        scores = process.cdist(
+            input_options,
+            valid_options,
+            scorer=fuzz.ratio,
+            processor=None,
+            score_cutoff=SUGGESTION_CUTOFF * 100,
+            workers=1,
+        )
+        best = scores.argmax(axis=1)
+        best_scores = scores.max(axis=1)
+        return [
+            (input_opt, valid_options[best[i]])
+            for i, input_opt in enumerate(input_options)
+            if best_scores[i] >= SUGGESTION_CUTOFF * 100
+        ]
+
+    suggestions = []
+    for input_opt in input_options:
+        match = _closest_option(input_opt, valid_options)
+        if match:
+            suggestions.append((input_opt, match))
+    return suggestions
+
+
+def _parse_enum_name(enum_type, s):
+    """Converts a member name to the corresponding member of enum_type."""
+    try:
+        return enum_type[s]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"{s!r} is not a valid {enum_type.__name__}")
+
+
+@lru_cache(maxsize=128)
+def _enum_metavar(enum_type):
+    """Returns the "[A|B|C]" metavar listing the member names of enum_type."""
+    return "[" + "|".join(e.name for e in enum_type) + "]"
+
+
+def _type_name(arg_type):
+    """Returns a readable name for an argument's type converter, defaulting to 'str'."""
+    if isinstance(arg_type, partial) and arg_type.func is _parse_enum_name:
+        return arg_type.args[0].__name__
+    return getattr(arg_type, "__name__", "str")
+
+
+class _AutofixedArgs(Exception):
+    """Carries the namespace re-parsed from autofixed arguments out of error()."""
+
+    def __init__(self, namespace):
+        super().__init__(namespace)
+        self.namespace = namespace
+
+
 class SnapArgumentParser(argparse.ArgumentParser):
     def __init__(self, *args, **kwargs):
         """
         Initializes the SnapArgumentParser with enhanced defaults.
         
-        Sets a custom help formatter with increased help position width and, for Python 3.12+, enables exit on error by default.
+        Sets a custom help formatter with increased help position width and, for Python 3.9+, enables exit on error by default.
         """
-        if sys.version_info > (3, 11):
+        if _SUPPORTS_EXIT_ON_ERROR:
             kwargs.setdefault("exit_on_error", True)
-        kwargs.setdefault(
-            "formatter_class", partial(argparse.HelpFormatter, max_help_position=35)
-        )
+        kwargs.setdefault("formatter_class", _DEFAULT_FORMATTER)
+        self._cached_actions = None
+        self._cached_valid_options = None
+        self._cached_valid_options_set = None
+        self._option_to_action = None
+        self._autofix_in_progress = False
+        self._parse_depth = 0
         super().__init__(*args, **kwargs)
 
     def add_argument(self, *args, **kwargs):
@@ -36,32 +201,71 @@ class SnapArgumentParser(argparse.ArgumentParser):
         """
         arg_type = kwargs.get("type")
         if isinstance(arg_type, type) and issubclass(arg_type, enum.Enum):
-            kwargs.setdefault("metavar", "[" + "|".join(e.name for e in arg_type) + "]")
+            kwargs.setdefault("metavar", _enum_metavar(arg_type))
 
-            def parse_enum(s):
-                try:
-                    return arg_type[s]
-                except KeyError:
-                    raise argparse.ArgumentTypeError(
-                        f"{s!r} is not a valid {arg_type.__name__}"
-                    )
-
-            kwargs["type"] = parse_enum
+            kwargs["type"] = partial(_parse_enum_name, arg_type)
 
         return super().add_argument(*args, **kwargs)
 
+    def _refresh_option_cache(self):
+        """
+        Rebuilds the cached option actions and option strings if they are out of date.
+
+        The cache is keyed on a snapshot of argparse's own option-string-to-action map, which
+        argument groups share and conflict resolution updates, so arguments added through groups
+        or replaced with conflict_handler="resolve" are picked up as well.
+        """
+        if (
+            self._option_to_action is not None
+            and self._option_to_action == self._option_string_actions
+        ):
+            return
+        actions = [a for a in self._actions if a.option_strings]
+        valid_options = tuple(opt for action in actions for opt in action.option_strings)
+        self._cached_actions = actions
+        self._cached_valid_options = valid_options
+        self._cached_valid_options_set = frozenset(valid_options)
+        self._option_to_action = dict(self._option_string_actions)
+
+    @property
+    def registered_actions(self):
+        """Cached list of argument actions that have associated option strings."""
+        self._refresh_option_cache()
+        return self._cached_actions
+
+    @property
+    def valid_options(self):
+        """Cached tuple of every registered option string, in registration order."""
+        self._refresh_option_cache()
+        return self._cached_valid_options
+
+    @property
+    def valid_options_set(self):
+        """Cached frozenset of every registered option string, for O(1) membership tests."""
+        self._refresh_option_cache()
+        return self._cached_valid_options_set
+
+    @property
+    def option_to_action(self):
+        """Cached mapping of each registered option string to its action."""
+        self._refresh_option_cache()
+        return self._option_to_action
+
     def get_registered_actions(self):
         """
         Returns a list of argument actions that have associated option strings.
         
         Only actions representing options (i.e., those with flags like '--foo') are included.
         """
-        return [a for a in self._actions if a.option_strings]
+        return list(self.registered_actions)
 
 
     def _autofix_arguments(self, suggestions, raw_args):
         """
         Replaces mistyped arguments in the input list with their suggested corrections.
+
+        For "--flag=value" arguments only the flag part is replaced, and nothing after a bare
+        "--" is touched.
         
         Args:
             suggestions: A list of (wrong, right) argument string pairs indicating corrections.
@@ -70,14 +274,14 @@ class SnapArgumentParser(argparse.ArgumentParser):
         Returns:
             A new list of arguments with mistyped entries replaced by their suggested corrections.
         """
+        fix_map = dict(suggestions)
         fixed_args = []
-        for arg in raw_args:
-            for wrong, right in suggestions:
-                if arg == wrong:
-                    fixed_args.append(right)
-                    break
-            else:
-                fixed_args.append(arg)
+        for i, arg in enumerate(raw_args):
+            if arg == "--":
+                fixed_args.extend(raw_args[i:])
+                break
+            flag, sep, value = arg.partition("=")
+            fixed_args.append(fix_map.get(flag, flag) + sep + value)
         return fixed_args
 
     def parse_args(self, args=None, namespace=None):
@@ -85,12 +289,19 @@ class SnapArgumentParser(argparse.ArgumentParser):
         Parses command-line arguments and checks for missing required options.
         
         If any required option arguments are missing after parsing, raises an error listing them.
+        If '--autofix' corrected the arguments during parsing, the corrected result is returned.
         """
-        parsed_args = super().parse_args(args, namespace)
+        self._parse_depth += 1
+        try:
+            parsed_args = super().parse_args(args, namespace)
+        except _AutofixedArgs as fixed:
+            parsed_args = fixed.namespace
+        finally:
+            self._parse_depth -= 1
         # Check for missing required arguments
         missing = []
-        for action in self.get_registered_actions():
-            if getattr(action, "required", False):
+        for action in self._actions:
+            if action.option_strings and getattr(action, "required", False):
                 value = getattr(parsed_args, action.dest, None)
                 if value is None:
                     missing.append(action.option_strings[0])
@@ -98,91 +309,98 @@ class SnapArgumentParser(argparse.ArgumentParser):
             self.error(f"the following arguments are required: {', '.join(missing)}")
         return parsed_args
 
+    def parse_known_args(self, args=None, namespace=None):
+        """
+        Parses known command-line arguments, returning the corrected result if '--autofix' ran.
+
+        Autofixed arguments have been fully re-parsed, so no unknown arguments are returned.
+        """
+        self._parse_depth += 1
+        try:
+            return super().parse_known_args(args, namespace)
+        except _AutofixedArgs as fixed:
+            return fixed.namespace, []
+        finally:
+            self._parse_depth -= 1
+
+    def _write_lines(self, lines):
+        """Writes the given lines to stdout in a single write, then flushes."""
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
     def error(self, message):
         """
         Handles command-line parsing errors with enhanced, colorized messages and suggestions.
         
         If a required argument value is missing, displays the expected type and usage tips. For mistyped flags, suggests corrections or automatically fixes them if '--autofix' is present, then exits the program.
+        Errors raised while re-parsing autofixed arguments fall back to plain argparse handling.
         """
-        valid_options = []
-        for action in self.get_registered_actions():
-            if action.option_strings:
-                valid_options.extend(action.option_strings)
+        if self._autofix_in_progress:
+            return super().error(message)
 
-        input_options = [arg for arg in sys.argv[1:] if arg.startswith("-")]
-
-        suggestions = []
-        for input_opt in input_options:
-            matches = difflib.get_close_matches(
-                input_opt, valid_options, n=3, cutoff=0.4
-            )
-            if matches:
-                suggestions.append((input_opt, matches[0]))
+        self._refresh_option_cache()
+        lines = []
 
         # 🟡 Case: Missing a value after a valid argument
-        if "expected one argument" in message:
-            for action in self.get_registered_actions():
-                if action.option_strings:
-                    for opt in action.option_strings:
-                        if opt in sys.argv:
-                            # Type hint (default to str if not set)
-                            type_hint = (
-                                action.type.__name__
-                                if hasattr(action.type, "__name__")
-                                else "str"
-                            )
-                            print(
-                                f"\n{YELLOW}Error:{RESET} {opt} expects a value of type {BOLD}{CYAN}{type_hint}{RESET}."
-                            )
-                            print(f"💡 Try: {opt}=value  or  {opt} value")
-                            print(
-                                f"\n{BOLD}Tip:{RESET} Run with {GREEN}--help{RESET} for usage examples."
-                            )
-                            self.exit(2)
+        expected = _EXPECTED_ARG_RE.match(message)
+        if expected:
+            names = expected.group(1).split("/")
+            action = self._option_to_action.get(names[0])
+            if action is not None:
+                opt = next((name for name in names if name in sys.argv), names[0])
+                type_hint = _type_name(action.type)
+                lines.append(_EXPECTS_VALUE.format(opt=opt, type_hint=type_hint))
+                lines.append(_TRY_VALUE.format(opt=opt))
+                lines.append(_TIP_EXAMPLES_LINE)
+                self._write_lines(lines)
+                self.exit(2)
+
+        valid_options = self._cached_valid_options
+        valid_options_set = self._cached_valid_options_set
+        # Only unknown flags need a suggestion; "--flag=value" is judged by its flag part.
+        # Like argparse, treat "-1" as a value unless the parser has negative-number-like
+        # options, and stop at a bare "--".
+        negative_numbers_are_values = not self._has_negative_number_optionals
+        input_options = []
+        for arg in sys.argv[1:]:
+            if arg == "--":
+                break
+            if not arg.startswith("-"):
+                continue
+            if negative_numbers_are_values and self._negative_number_matcher.match(arg):
+                continue
+            opt = arg.split("=", 1)[0]
+            if opt not in valid_options_set:
+                input_options.append(opt)
+
+        suggestions = _closest_options(input_options, valid_options)
 
         # 🔴 Case: Mistyped flags
         if suggestions:
-            if "--autofix" in sys.argv:
-                print(f"{CYAN}Auto-fix enabled. Correcting and re-parsing...{RESET}")
+            # Autofix can only return a corrected result from inside parse_args/parse_known_args
+            if "--autofix" in sys.argv and self._parse_depth:
+                lines.append(_AUTOFIX_LINE)
+                self._write_lines(lines)
                 fixed_args = self._autofix_arguments(suggestions, sys.argv[1:])
                 sys.argv = [sys.argv[0]] + fixed_args
-                self.parse_args()
-                return
+                self._autofix_in_progress = True
+                try:
+                    fixed_namespace = super().parse_args()
+                finally:
+                    self._autofix_in_progress = False
+                # Unwind the original parse; parse_args/parse_known_args return this instead
+                raise _AutofixedArgs(fixed_namespace)
 
             for wrong, suggestion in suggestions:
-                print(
-                    f"  Did you mean: {RED}{wrong}{RESET} → {BOLD}{GREEN}{suggestion}{RESET}?"
-                )
+                lines.append(_DID_YOU_MEAN.format(wrong=wrong, right=suggestion))
 
-                # Default argparse fallback
-                print(f"\n{RED}Error:{RESET} {message}")
-                print(f"\n{BOLD}Tip:{RESET} Run with {GREEN}--help{RESET} for usage.")
-                self.exit(2)
+        # Default argparse fallback
+        lines.append(_ERROR_LINE.format(message=message))
+        lines.append(_TIP_LINE)
+        self._write_lines(lines)
+        self.exit(2)
 
     def format_help(self):
         help_text = super().format_help()
-        help_text = help_text.replace(
-            "optional arguments:", f"{CYAN}Optional arguments:{RESET}"
-        )
-        help_text = help_text.replace("options:", f"{CYAN}Optional arguments:{RESET}")
-        help_text = help_text.replace(
-            "positional arguments:", f"{CYAN}Positional arguments:{RESET}"
-        )
-        return help_text
+        return _HELP_SECTION_RE.sub(lambda m: _HELP_SECTION_REPL[m.group(0)], help_text)
 
-
-# Example usage
-if __name__ == "__main__":
-
-    class Mode(enum.Enum):
-        FAST = "FAST"
-        SLOW = "SLOW"
-        MEDIUM = "MEDIUM"
-
-    parser = SnapArgumentParser(description="Demo script with snaparg features.")
-    parser.add_argument("--mode", type=Mode, help="Choose a processing mode.")
-    parser.add_argument("--count", type=int, help="Number of things to process.")
-    parser.add_argument(
-        "--autofix", action="store_true", help="Automatically fix mistyped arguments."
-    )
-    args = parser.parse_args()
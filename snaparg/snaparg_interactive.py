@@ -1,6 +1,8 @@
 import sys
 from .snaparg import SnapArgumentParser
 
+__all__ = ["interactive_parse"]
+
 def interactive_parse(parser: SnapArgumentParser):
     """
     Parses command-line arguments, interactively prompting for any missing required values.
@@ -11,14 +13,18 @@ def interactive_parse(parser: SnapArgumentParser):
         return parser.parse_args()
     except SystemExit:
         # Find required args not in sys.argv
+        argv_set = set(sys.argv)
+        option_to_action = parser.option_to_action
+        given = {option_to_action[opt] for opt in option_to_action.keys() & argv_set}
         missing_args = [
             action for action in parser._actions
             if action.required and (
-                (action.option_strings and f'--{action.dest}' not in sys.argv) or
-                (not action.option_strings and action.dest not in sys.argv)
+                (action.option_strings and action not in given) or
+                (not action.option_strings and action.dest not in argv_set)
             )
         ]
 
+        extra = []
         for action in missing_args:
             if action.option_strings:
                 prompt = f"Enter value for --{action.dest}"
@@ -32,9 +38,10 @@ def interactive_parse(parser: SnapArgumentParser):
                 value = input(prompt)
                 try:
                     value = action.type(value) if action.type else value
-                    sys.argv.extend([f"--{action.dest}", str(value)])
+                    extra.extend([f"--{action.dest}", str(value)])
                     break
                 except Exception as e:
                     print(f"Invalid value: {e}")
 
+        sys.argv.extend(extra)
         return parser.parse_args()
@@ -61,3 +61,227 @@ def test_help_coloring(monkeypatch):
 
     help_output = f.getvalue()
     assert "\033[96mOptional arguments:\033[0m" in help_output  # ANSI cyan
+
+
+def test_valid_flag_not_suggested(monkeypatch):
+    test_args = ["progname", "--count", "3", "--moed", "FAST"]
+    monkeypatch.setattr(sys, "argv", test_args)
+
+    output = StringIO()
+    with redirect_stdout(output):
+        parser = SnapArgumentParser()
+        parser.add_argument("--mode", type=Mode)
+        parser.add_argument("--count", type=int)
+
+        try:
+            parser.parse_args()
+        except SystemExit:
+            pass
+
+    output_value = output.getvalue()
+    assert "--moed" in output_value
+    assert "--count\033[0m →" not in output_value, "valid flag was re-suggested"
+
+
+def test_valid_options_cache_tracks_new_arguments():
+    parser = SnapArgumentParser()
+    parser.add_argument("--mode", type=Mode)
+    assert "--mode" in parser.valid_options_set
+
+    group = parser.add_argument_group("extra")
+    group.add_argument("--count", type=int)
+    assert parser.valid_options == ("-h", "--help", "--mode", "--count")
+
+    # Replacing an action keeps the action count the same
+    parser = SnapArgumentParser(conflict_handler="resolve")
+    parser.add_argument("--foo")
+    assert "--foo" in parser.valid_options_set
+
+    parser.add_argument("--foo", "--bar", type=int)
+    assert "--bar" in parser.valid_options_set
+    assert parser.option_to_action["--foo"].type is int
+    assert parser.option_to_action["--foo"] is parser.option_to_action["--bar"]
+
+
+def test_transposed_letters_suggest_closest_flag(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["progname", "--fromat", "json"])
+
+    output = StringIO()
+    with redirect_stdout(output):
+        parser = SnapArgumentParser()
+        parser.add_argument("--from")
+        parser.add_argument("--format")
+
+        with pytest.raises(SystemExit):
+            parser.parse_args()
+
+    assert "\033[92m--format\033[0m?" in output.getvalue()
+
+
+def test_missing_value_names_offending_flag(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["progname", "--name", "x", "--count"])
+
+    output = StringIO()
+    with redirect_stdout(output):
+        parser = SnapArgumentParser()
+        parser.add_argument("--name")
+        parser.add_argument("-c", "--count", type=int)
+
+        with pytest.raises(SystemExit):
+            parser.parse_args()
+
+    output_value = output.getvalue()
+    assert "--count expects a value of type" in output_value
+    assert "--name expects" not in output_value
+
+
+def test_missing_enum_value_names_enum_class(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["progname", "--mode"])
+
+    output = StringIO()
+    with redirect_stdout(output):
+        parser = SnapArgumentParser()
+        parser.add_argument("--mode", type=Mode)
+
+        with pytest.raises(SystemExit):
+            parser.parse_args()
+
+    assert "--mode expects a value of type \033[1m\033[96mMode\033[0m" in output.getvalue()
+
+
+def test_autofix_returns_corrected_args(monkeypatch):
+    test_args = ["progname", "--moed=FAST", "--cuont", "2", "--autofix"]
+    monkeypatch.setattr(sys, "argv", test_args)
+
+    output = StringIO()
+    with redirect_stdout(output):
+        parser = SnapArgumentParser()
+        parser.add_argument("--mode", type=Mode)
+        parser.add_argument("--count", type=int)
+        parser.add_argument("--autofix", action="store_true")
+        args = parser.parse_args()
+
+    assert args.mode == Mode.FAST
+    assert args.count == 2
+    assert args.autofix
+    assert "Auto-fix enabled" in output.getvalue()
+
+
+def test_all_suggestions_shown_once(monkeypatch):
+    test_args = ["progname", "--moed", "FAST", "--cuont", "3"]
+    monkeypatch.setattr(sys, "argv", test_args)
+
+    output = StringIO()
+    with redirect_stdout(output):
+        parser = SnapArgumentParser()
+        parser.add_argument("--mode", type=Mode)
+        parser.add_argument("--count", type=int)
+
+        with pytest.raises(SystemExit):
+            parser.parse_args()
+
+    output_value = output.getvalue()
+    assert output_value.count("Did you mean") == 2
+    assert output_value.count("Error:") == 1
+
+
+def test_error_without_suggestion_exits(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["progname"])
+
+    output = StringIO()
+    with redirect_stdout(output):
+        parser = SnapArgumentParser()
+        parser.add_argument("--count", type=int, required=True)
+
+        with pytest.raises(SystemExit):
+            parser.parse_args()
+
+    assert "required: --count" in output.getvalue()
+
+
+def test_autofix_under_parse_known_args(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["progname", "--nmae", "x", "--autofix"])
+
+    output = StringIO()
+    with redirect_stdout(output):
+        parser = SnapArgumentParser()
+        parser.add_argument("--name", required=True)
+        parser.add_argument("--autofix", action="store_true")
+        args, unknown = parser.parse_known_args()
+
+        assert args.name == "x"
+        assert unknown == []
+
+        # Later errors must still exit, even with a typo left in argv
+        monkeypatch.setattr(sys, "argv", ["progname", "--nmae", "x", "--autofix"])
+        with pytest.raises(SystemExit):
+            parser.error("something went wrong")
+
+
+OPTIONS = ("-h", "--help", "--from", "--format", "--verbose", "--count", "-x", "--x")
+TYPOS = ["--fromat", "--verbos", "--cuont", "--xx", "--X", "--zzzzzzzzzzzz"]
+
+
+def _expected_suggestions():
+    import difflib
+
+    expected = []
+    for typo in TYPOS:
+        matches = difflib.get_close_matches(typo, OPTIONS, n=1, cutoff=0.4)
+        if matches:
+            expected.append((typo, matches[0]))
+    return expected
+
+
+def test_difflib_suggestions(monkeypatch):
+    from snaparg import snaparg as snaparg_module
+
+    monkeypatch.setattr(snaparg_module, "_rapidfuzz", lambda: None)
+    assert snaparg_module._closest_options(TYPOS, OPTIONS) == _expected_suggestions()
+
+
+def test_rapidfuzz_suggestions():
+    pytest.importorskip("rapidfuzz")
+    from snaparg import snaparg as snaparg_module
+
+    suggestions = [
+        (typo, snaparg_module._closest_option(typo, OPTIONS)) for typo in TYPOS
+    ]
+    assert [s for s in suggestions if s[1]] == _expected_suggestions()
+
+
+def test_rapidfuzz_batch_suggestions(monkeypatch):
+    pytest.importorskip("rapidfuzz")
+    pytest.importorskip("numpy")
+    from snaparg import snaparg as snaparg_module
+
+    monkeypatch.setattr(snaparg_module, "_BATCH_MIN_CELLS", 0)
+
+    assert snaparg_module._closest_options(TYPOS, OPTIONS) == _expected_suggestions()
+
+
+def test_negative_numbers_and_double_dash_not_suggested(monkeypatch):
+    test_args = ["progname", "--count", "-1", "--verbsoe", "--", "--verbsoe"]
+    monkeypatch.setattr(sys, "argv", test_args)
+
+    output = StringIO()
+    with redirect_stdout(output):
+        parser = SnapArgumentParser()
+        parser.add_argument("--count", type=int)
+        parser.add_argument("--verbose", action="store_true")
+
+        with pytest.raises(SystemExit):
+            parser.parse_args()
+
+    output_value = output.getvalue()
+    assert "-1\033[0m →" not in output_value
+    assert output_value.count("Did you mean") == 1
+
+    test_args = ["progname", "--count", "-1", "--verbsoe", "--autofix"]
+    monkeypatch.setattr(sys, "argv", test_args)
+    with redirect_stdout(StringIO()):
+        parser.add_argument("--autofix", action="store_true")
+        args = parser.parse_args()
+
+    assert args.count == -1
+    assert args.verbose